@@ -0,0 +1,5 @@
+"""Calculate PIT 38 based on E*TRADE statements."""
+
+from .api import Rates, Report, compute
+
+__all__ = ["Rates", "Report", "compute"]
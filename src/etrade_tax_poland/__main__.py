@@ -3,6 +3,7 @@
 from .args import parse_args
 from .dividends import process_dividend_docs
 from .files_handling import merge_csvs
+from .pipeline import print_stages_stats, process_docs_streaming
 from .stocks import process_stock_docs
 
 
@@ -14,6 +15,11 @@ def parse_all_docs(dir_path, debug=False):
 
 if __name__ == "__main__":
     args = parse_args()
-    parse_all_docs(args.dirpath, debug=args.debug)
+    if args.stream or args.stats:
+        stats = process_docs_streaming(args.dirpath, debug=args.debug, queue_size=args.queue_size)
+        if args.stats:
+            print_stages_stats(stats)
+    else:
+        parse_all_docs(args.dirpath, debug=args.debug)
     if not args.no_xlsx:
         merge_csvs()
@@ -0,0 +1,54 @@
+"""Compute records from in-memory statements, without filesystem side effects."""
+
+import os
+import threading
+
+from . import files_handling as fh
+from .cache.intc import IntcPricesCache
+from .cache.nbp import NbpRatiosCache
+from .pipeline import parse_records, resolve_rates
+from .report import Report
+
+
+class Rates:  # pylint: disable=too-few-public-methods
+    """USD/PLN ratios and intc prices caches, shared across compute calls."""
+
+    # only holds the caches injected into compute, lookups stay in the caches modules
+
+    def __init__(self, nbp_cache=None, intc_cache=None):
+        """Init with given caches, by default in-memory copies of the bundled ones."""
+        self.nbp_cache = nbp_cache if nbp_cache is not None else NbpRatiosCache(read_only=True)
+        self.intc_cache = intc_cache if intc_cache is not None else IntcPricesCache(read_only=True)
+
+
+_DEFAULT_RATES = None
+_DEFAULT_RATES_LOCK = threading.Lock()
+
+
+def default_rates():
+    """Get rates shared by all compute calls without explicit rates."""
+    global _DEFAULT_RATES  # pylint: disable=global-statement
+    with _DEFAULT_RATES_LOCK:
+        if _DEFAULT_RATES is None:
+            _DEFAULT_RATES = Rates()
+    return _DEFAULT_RATES
+
+
+def read_document(index, document):
+    """Return name and content of PDF document given as bytes or path."""
+    if isinstance(document, (bytes, bytearray, memoryview)):
+        return f"document_{index}.pdf", bytes(document)
+    with open(document, "rb") as file:
+        return os.fspath(document), file.read()
+
+
+def compute(documents, rates=None):
+    """Compute report from PDF statements given as bytes or paths, thread-safe."""
+    if rates is None:
+        rates = default_rates()
+    report = Report()
+    for index, document in enumerate(documents):
+        name, data = read_document(index, document)
+        for record in parse_records(fh.bytes_to_text(data), name):
+            report.add(resolve_rates(record, rates.nbp_cache, rates.intc_cache))
+    return report
@@ -11,9 +11,15 @@ def parse_args():
     parser.add_argument("dirpath", nargs="?", default=".", help="Get statements path")
     parser.add_argument("-x", "--no-xlsx", action="store_true")
     parser.add_argument("-d", "--debug", action="store_true")
+    parser.add_argument("-s", "--stream", action="store_true", help="Process in a pipeline")
+    parser.add_argument("-q", "--queue-size", type=int, default=4, help="Pipeline queues depth")
+    parser.add_argument("--stats", action="store_true", help="Print pipeline stages statistics")
     args = parser.parse_args()
     if not os.path.isdir(args.dirpath):
         print("Provided path is not a directory")
         sys.exit(1)
+    if args.queue_size < 1:
+        print("Queue size has to be positive")
+        sys.exit(1)
     args.dirpath = os.path.abspath(args.dirpath)
     return args
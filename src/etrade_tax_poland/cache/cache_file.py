@@ -2,14 +2,17 @@
 
 import json
 import os
+import threading
 
 
 class CacheFile:
     """Handle Cache in file stored locally"""
 
-    def __init__(self, cache_file_name):
+    def __init__(self, cache_file_name, read_only=False):
         self.cache_file = cache_file_name
+        self.read_only = read_only
         self.cache = {"_": ""}
+        self.lock = threading.Lock()
         self.read_cache()
 
     def read_cache(self):
@@ -20,7 +23,9 @@ class CacheFile:
             self.cache = json.load(file)
 
     def write_cache(self):
-        """Write cache file."""
+        """Write cache file, unless cache is kept in memory only."""
+        if self.read_only:
+            return
         json_dump_params = {
             "sort_keys": True,
             "indent": 2,
@@ -2,6 +2,7 @@
 
 import datetime
 import os
+import threading
 
 import requests
 
@@ -13,9 +14,10 @@ class IntcPricesCache(CacheFile):
 
     date_format = "%Y-%m-%d"
 
-    def __init__(self):
+    def __init__(self, read_only=False):
         """Initialize objects and fields."""
-        super().__init__(f"{os.path.dirname(os.path.abspath(__file__))}/.intc_cache.json")
+        cache_dir = os.path.dirname(os.path.abspath(__file__))
+        super().__init__(f"{cache_dir}/.intc_cache.json", read_only)
         self.begin_date = datetime.datetime(2000, 1, 1, 0, 0)
 
     def fill_in(self, token: str, end_date: datetime.datetime):
@@ -49,9 +51,10 @@ class IntcPricesCache(CacheFile):
         response = requests.get(url, headers=headers, params=params, timeout=60)
 
         if response.status_code == 200:
-            for entry in response.json()["results"]["history"][0]["eoddata"]:
-                self.cache[entry["date"]] = entry["close"]
-            self.write_cache()
+            with self.lock:
+                for entry in response.json()["results"]["history"][0]["eoddata"]:
+                    self.cache[entry["date"]] = entry["close"]
+                self.write_cache()
         else:
             print(f"Request failed with status code: {response.status_code}.")
             if response.status_code == 403:
@@ -65,15 +68,34 @@ class IntcPricesCache(CacheFile):
         raise ValueError(f"Price for {date_obj.strftime(self.date_format)} was not found")
 
 
-INTC_CACHE = IntcPricesCache()
+_INTC_CACHE = None
+_INTC_CACHE_LOCK = threading.Lock()
 
 
-def date_to_intc_price(date_obj):
+def intc_cache():
+    """Get the shared intc prices cache, reading the cache file on first use."""
+    global _INTC_CACHE  # pylint: disable=global-statement
+    with _INTC_CACHE_LOCK:
+        if _INTC_CACHE is None:
+            _INTC_CACHE = IntcPricesCache()
+    return _INTC_CACHE
+
+
+def __getattr__(name):
+    """Keep INTC_CACHE available, without reading the cache file at import."""
+    if name == "INTC_CACHE":
+        return intc_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def date_to_intc_price(date_obj, cache=None):
     """Find intc price for date."""
+    if cache is None:
+        cache = intc_cache()
     days = 10  # check up to 10 days back, otherwise raise exception
     for _ in range(days):
         try:
-            ratio = INTC_CACHE.get_ratio(date_obj)
+            ratio = cache.get_ratio(date_obj)
             return (date_obj, ratio)
         except ValueError:
             date_obj -= datetime.timedelta(days=1)
@@ -2,6 +2,7 @@
 
 import datetime
 import os
+import threading
 from time import sleep
 
 import requests
@@ -15,18 +16,27 @@ class NbpRatiosCache(CacheFile):
     date_format = "%Y-%m-%d"
     nbp_url = "https://api.nbp.pl/api/exchangerates/rates/a/usd/{}/?format=json"
 
-    def __init__(self):
+    def __init__(self, read_only=False):
         """Initialize objects and fields."""
-        super().__init__(f"{os.path.dirname(os.path.abspath(__file__))}/.nbp_cache.json")
+        cache_dir = os.path.dirname(os.path.abspath(__file__))
+        super().__init__(f"{cache_dir}/.nbp_cache.json", read_only)
 
     def get_ratio(self, date_obj):
         """Get ratio from cache if available, otherwise request from NBP."""
         key = date_obj.strftime(self.date_format)
-        if key in self.cache:
-            if not self.cache[key]:
-                raise ValueError("Ratio for selected date is not available in NBP")
-            return self.cache[key]
+        with self.lock:
+            ratio = self.cache.get(key)
+        if ratio is None:
+            ratio = self.request_ratio(date_obj)
+            with self.lock:
+                self.cache[key] = ratio
+                self.write_cache()
+        if not ratio:
+            raise ValueError("Ratio for selected date is not available in NBP")
+        return ratio
 
+    def request_ratio(self, date_obj):
+        """Request ratio from NBP, empty string if there is none for the date."""
         while True:
             try:
                 current_url = self.nbp_url.format(date_obj.strftime(self.date_format))
@@ -36,28 +46,43 @@ class NbpRatiosCache(CacheFile):
                 sleep(1)
                 continue
             if req.status_code == 200:
-                self.cache[key] = req.json()["rates"][0]["mid"]
-                self.write_cache()
-                return self.cache[key]
+                return req.json()["rates"][0]["mid"]
             if req.status_code == 404:
-                self.cache[key] = ""
-                self.write_cache()
-                raise ValueError("Ratio for selected date is not available in NBP")
+                return ""
             print(f"{req.status_code} {req.text}")
             print("Unhandled error when getting USD/PLN ratio, retrying after 1 second")
             sleep(1)
             continue
 
 
-NBP_CACHE = NbpRatiosCache()
+_NBP_CACHE = None
+_NBP_CACHE_LOCK = threading.Lock()
+
+
+def nbp_cache():
+    """Get the shared NBP cache, reading the cache file on first use."""
+    global _NBP_CACHE  # pylint: disable=global-statement
+    with _NBP_CACHE_LOCK:
+        if _NBP_CACHE is None:
+            _NBP_CACHE = NbpRatiosCache()
+    return _NBP_CACHE
+
+
+def __getattr__(name):
+    """Keep NBP_CACHE available, without reading the cache file at import."""
+    if name == "NBP_CACHE":
+        return nbp_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def date_to_usd_pln(date_obj):
+def date_to_usd_pln(date_obj, cache=None):
     """Find 'day before vestment' USD/PLN ratio."""
+    if cache is None:
+        cache = nbp_cache()
     while True:
         date_obj -= datetime.timedelta(days=1)
         try:
-            ratio = NBP_CACHE.get_ratio(date_obj)
+            ratio = cache.get_ratio(date_obj)
             break
         except ValueError:
             date_obj -= datetime.timedelta(days=1)
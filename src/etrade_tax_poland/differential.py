@@ -0,0 +1,245 @@
+"""
+Compare records of optimized processing modes against the reference one.
+
+All modes process the same statements with the same offline rates snapshot,
+every Dividend and StockEvent row has to be equal to the reference one,
+in the same order, and so does the csv text written from them.
+
+Example usage:
+python3 -m etrade_tax_poland.differential /tmp/statements -m api,parallel,streaming -r 3
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import dividends, stocks
+from .api import Rates, compute
+from .cache.intc import IntcPricesCache
+from .cache.nbp import NbpRatiosCache
+from .pipeline import run_pipeline
+from .report import Report
+
+
+class SnapshotNbpRatiosCache(NbpRatiosCache):
+    """NBP ratios from a fixed snapshot, never requested from NBP."""
+
+    def __init__(self, cache):
+        """Initialize with a copy of the snapshot."""
+        super().__init__(read_only=True)
+        self.cache = dict(cache)
+
+    def request_ratio(self, date_obj):
+        """Fail instead of requesting a ratio missing in the snapshot."""
+        raise LookupError(f"Ratio for {date_obj.strftime(self.date_format)} is not in the snapshot")
+
+
+class SnapshotIntcPricesCache(IntcPricesCache):
+    """Intc prices from a fixed snapshot."""
+
+    def __init__(self, cache):
+        """Initialize with a copy of the snapshot."""
+        super().__init__(read_only=True)
+        self.cache = dict(cache)
+
+
+def read_json(filename):
+    """Read json file."""
+    with open(filename, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def load_snapshot(nbp_file=None, intc_file=None):
+    """Load NBP ratios and intc prices, bundled caches by default."""
+    nbp = read_json(nbp_file) if nbp_file else NbpRatiosCache(read_only=True).cache
+    intc = read_json(intc_file) if intc_file else IntcPricesCache(read_only=True).cache
+    return nbp, intc
+
+
+def reference_mode(files, rates):
+    """Process files with the code behind process_dividend_docs and process_stock_docs."""
+    report = Report()
+    report.dividends = dividends.dividends_from_files(files, rates.nbp_cache)
+    stock_records = stocks.stocks_from_files(files, rates.nbp_cache, rates.intc_cache)
+    report.espps, report.rests, report.trades = stock_records
+    return report
+
+
+def api_mode(files, rates):
+    """Process files with the library API."""
+    return compute(files, rates)
+
+
+def parallel_mode(files, rates):
+    """Process every file in a separate thread with the library API, sharing rates."""
+    with ThreadPoolExecutor() as executor:
+        reports = list(executor.map(lambda full_path: compute([full_path], rates), files))
+    report = Report()
+    for part in reports:
+        for record in part.dividends + part.espps + part.rests + part.trades:
+            report.add(record)
+    return report
+
+
+def streaming_mode(files, rates):
+    """Process files in the streaming pipeline."""
+    report = Report()
+    run_pipeline(files, report.add, nbp_cache=rates.nbp_cache, intc_cache=rates.intc_cache)
+    return report
+
+
+MODES = {
+    "reference": reference_mode,
+    "api": api_mode,
+    "parallel": parallel_mode,
+    "streaming": streaming_mode,
+}
+
+
+def diff_rows(kind, reference, other):
+    """List mismatches of records in output order, as (kind, file, row, field, ref, other)."""
+    mismatches = []
+    for i in range(max(len(reference), len(other))):
+        if i >= len(other):
+            mismatches.append((kind, reference[i].file, i, "<record>", "present", "missing"))
+            continue
+        if i >= len(reference):
+            mismatches.append((kind, other[i].file, i, "<record>", "missing", "present"))
+            continue
+        ref_fields = vars(reference[i])
+        other_fields = vars(other[i])
+        for field in sorted(ref_fields.keys() | other_fields.keys()):
+            ref_value = ref_fields.get(field)
+            other_value = other_fields.get(field)
+            if ref_value != other_value:
+                mismatches.append((kind, reference[i].file, i, field, ref_value, other_value))
+    return mismatches
+
+
+def diff_csv(kind, reference, other):
+    """List mismatches of csv text lines, the exact content of the output files."""
+    ref_lines = reference.splitlines()
+    other_lines = other.splitlines()
+    mismatches = []
+    for i in range(max(len(ref_lines), len(other_lines))):
+        ref_line = ref_lines[i] if i < len(ref_lines) else None
+        other_line = other_lines[i] if i < len(other_lines) else None
+        if ref_line != other_line:
+            mismatches.append((kind, "<csv>", i, "<line>", ref_line, other_line))
+    return mismatches
+
+
+def diff_reports(reference, other):
+    """List mismatches of dividend and stock rows, both records and csv text, in output order."""
+    return (
+        diff_rows("Dividend", reference.dividends, other.dividends)
+        + diff_rows("StockEvent", reference.stock_events(), other.stock_events())
+        + diff_csv("_dividend.csv", reference.dividends_csv(), other.dividends_csv())
+        + diff_csv("_stocks.csv", reference.stocks_csv(), other.stocks_csv())
+    )
+
+
+class ModeResult:
+    """Keep timing and mismatches of a single mode."""
+
+    def __init__(self, name, seconds, report):
+        """Init mode result."""
+        self.name = name
+        self.seconds = seconds
+        self.report = report
+        self.ratio = 1.0
+        self.mismatches = []
+
+    def csved(self):
+        """Csved class object."""
+        return ",".join(
+            [
+                self.name,
+                f"{len(self.report.dividends) + len(self.report.stock_events())}",
+                f"{self.seconds:.3f}",
+                f"{self.ratio:.2f}",
+                f"{len(self.mismatches)}",
+            ]
+        )
+
+    @staticmethod
+    def csv_header():
+        """Return table header for CSVed objects."""
+        return ",".join(["MODE", "RECORDS", "SECONDS", "RATIO_TO_REFERENCE", "MISMATCHES"])
+
+
+def run_mode(name, files, snapshot, repeat=1):
+    """Run mode with fresh snapshot rates, keep the best time of all repeats."""
+    best = None
+    report = None
+    for _ in range(repeat):
+        rates = Rates(SnapshotNbpRatiosCache(snapshot[0]), SnapshotIntcPricesCache(snapshot[1]))
+        start = time.perf_counter()
+        report = MODES[name](files, rates)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return ModeResult(name, best, report)
+
+
+def compare_modes(files, modes, snapshot, repeat=1):
+    """Run reference and all other modes, diff their rows against the reference."""
+    reference = run_mode("reference", files, snapshot, repeat)
+    results = [reference]
+    for name in modes:
+        if name == "reference":
+            continue
+        result = run_mode(name, files, snapshot, repeat)
+        result.ratio = result.seconds / reference.seconds if reference.seconds else 0.0
+        result.mismatches = diff_reports(reference.report, result.report)
+        results.append(result)
+    return results
+
+
+def print_results(results):
+    """Print timing table and all mismatches."""
+    print(ModeResult.csv_header())
+    for result in results:
+        print(result.csved())
+    for result in results:
+        for kind, file, index, field, ref_value, value in result.mismatches:
+            print(f"{result.name}: {kind} {file} #{index} {field}: {ref_value!r} != {value!r}")
+
+
+def parse_args():
+    """Parse CLI arguments."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dirpath", nargs="?", default=".", help="Get statements path")
+    parser.add_argument("-m", "--modes", default=",".join(MODES), help="Comma separated modes")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="Runs per mode, best time wins")
+    parser.add_argument("--nbp-snapshot", help="NBP ratios json, bundled cache by default")
+    parser.add_argument("--intc-snapshot", help="Intc prices json, bundled cache by default")
+    args = parser.parse_args()
+    if not os.path.isdir(args.dirpath):
+        print("Provided path is not a directory")
+        sys.exit(1)
+    args.modes = args.modes.split(",")
+    for mode in args.modes:
+        if mode not in MODES:
+            print(f"Unknown mode {mode}, available: {', '.join(MODES)}")
+            sys.exit(1)
+    args.dirpath = os.path.abspath(args.dirpath)
+    return args
+
+
+def main():
+    """Compare modes on statements in a directory, exit with 1 on any mismatch."""
+    args = parse_args()
+    files = sorted(glob.glob(os.path.join(glob.escape(args.dirpath), "*.pdf")))
+    snapshot = load_snapshot(args.nbp_snapshot, args.intc_snapshot)
+    results = compare_modes(files, args.modes, snapshot, max(args.repeat, 1))
+    print_results(results)
+    if any(result.mismatches for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
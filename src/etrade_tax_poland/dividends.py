@@ -1,16 +1,17 @@
 """Find all statements for dividends in a directory and count the due tax."""
 
+import os
 from datetime import datetime
 
 from . import files_handling as fh
 from .cache.nbp import date_to_usd_pln
-from .maths import ISO_DATE, TAX_PL, cash_float
+from .maths import ISO_DATE, TAX_PL, Money
 
 
 class Dividend:
     """Keep all dividend data in an object."""
 
-    def __init__(self, pay_date: datetime, gross: float, tax: float, net: float):
+    def __init__(self, pay_date: datetime, gross: Money, tax: Money, net: Money):
         """Initialize an object."""
         self.pay_date = pay_date
         self.usd_gross = gross
@@ -18,10 +19,10 @@ class Dividend:
         self.usd_net = net
         self.ratio_date = datetime.fromtimestamp(0)
         self.ratio_value = 0.0
-        self.pln_gross = 0.0
-        self.flat_rate_tax = 0.0
-        self.pln_tax_paid = 0.0
-        self.pln_tax_due = 0.0
+        self.pln_gross = Money()
+        self.flat_rate_tax = Money()
+        self.pln_tax_paid = Money()
+        self.pln_tax_due = Money()
         self.file = ""
 
     def csved(self):
@@ -29,9 +30,9 @@ class Dividend:
         return ",".join(
             [
                 self.pay_date.strftime(ISO_DATE),
-                f"{self.flat_rate_tax:.2f}",
-                f"{self.pln_tax_paid:.2f}",
-                f"{self.pln_tax_due:.2f}",
+                str(self.flat_rate_tax),
+                str(self.pln_tax_paid),
+                str(self.pln_tax_due),
             ]
         )
 
@@ -47,17 +48,17 @@ class Dividend:
             ]
         )
 
-    def insert_currencies_ratio(self):
+    def insert_currencies_ratio(self, nbp_cache=None):
         """Insert currencies ratio and calculate dependent variables."""
-        self.ratio_date, self.ratio_value = date_to_usd_pln(self.pay_date)
-        self.pln_gross = round(self.usd_gross * self.ratio_value, 2)
-        self.flat_rate_tax = round(self.pln_gross * TAX_PL, 2)
-        self.pln_tax_paid = round(self.usd_tax * self.ratio_value, 2)
+        self.ratio_date, self.ratio_value = date_to_usd_pln(self.pay_date, nbp_cache)
+        self.pln_gross = self.usd_gross * self.ratio_value
+        self.flat_rate_tax = self.pln_gross * TAX_PL
+        self.pln_tax_paid = self.usd_tax * self.ratio_value
         self.pln_tax_due = self.flat_rate_tax - self.pln_tax_paid
 
 
-def get_stock_dividends_from_text(text):
-    """Get dividend data from text."""
+def get_stock_dividends_from_text(text, resolve=True, nbp_cache=None):
+    """Get dividend data from text, resolve rates unless disabled."""
     dividend_lines_starts = []
     year_line = ""
     dividends = []
@@ -81,7 +82,7 @@ def get_stock_dividends_from_text(text):
             offset = dividend_lines_start
             str_date = f"{lines[offset].split()[0]}/{year_line.split()[-1]}"
             pay_date = datetime.strptime(str_date, "%m/%d/%Y")
-            gross = cash_float(lines[offset].split()[-1])
+            gross = Money.parse(lines[offset].split()[-1])
 
             # depends on the file, table can be continued on the next page
             while offset < len(lines) and "Tax Withholding" not in lines[offset]:
@@ -89,7 +90,7 @@ def get_stock_dividends_from_text(text):
             if offset == len(lines):
                 print(f"Did not found all dividend fields for {gross} gross value")
                 continue
-            tax = cash_float(lines[offset].split()[-1])
+            tax = Money.parse(lines[offset].split()[-1])
             net = gross - tax
         else:
             # before 09.2023 doc version, example:
@@ -102,17 +103,18 @@ def get_stock_dividends_from_text(text):
             dividend_lines = lines[dividend_lines_start : dividend_lines_start + 6]
             date = dividend_lines[0].split()[0]
             pay_date = datetime.strptime(f"{date[:-2]}20{date[-2:]}", "%m/%d/%Y")
-            gross = cash_float(dividend_lines[3].split()[-1])
-            tax = cash_float(dividend_lines[3].split()[-2])
-            net = cash_float(dividend_lines[5].split()[-1])
+            gross = Money.parse(dividend_lines[3].split()[-1])
+            tax = Money.parse(dividend_lines[3].split()[-2])
+            net = Money.parse(dividend_lines[5].split()[-1])
         dividend = Dividend(pay_date, gross, tax, net)
-        dividend.insert_currencies_ratio()
+        if resolve:
+            dividend.insert_currencies_ratio(nbp_cache)
         dividends.append(dividend)
     return dividends
 
 
-def get_liquidity_dividends_from_text(text):
-    """Get liquidity dividend data from text."""
+def get_liquidity_dividends_from_text(text, resolve=True, nbp_cache=None):
+    """Get liquidity dividend data from text, resolve rates unless disabled."""
     ldivs = []
     year = ""
     lines = text.split("\n")
@@ -125,31 +127,39 @@ def get_liquidity_dividends_from_text(text):
             if "Transaction Reportable for the Prior Year" in line:
                 # '1/2 Dividend TREASURY LIQUIDITY FUND Transaction \
                 # Reportable for the Prior Year. $0.01'
-                amount = cash_float(lines[i].split()[-1])
+                amount = Money.parse(lines[i].split()[-1])
             else:
                 # [i]   '10/2 Dividend TREASURY LIQUIDITY FUND'
                 # [i+1] 'DIV PAYMENT$0.23'
-                amount = cash_float(lines[i + 1].split("PAYMENT")[-1])
-            dividend = Dividend(date, amount, 0, amount)
-            dividend.insert_currencies_ratio()
+                amount = Money.parse(lines[i + 1].split("PAYMENT")[-1])
+            dividend = Dividend(date, amount, Money(), amount)
+            if resolve:
+                dividend.insert_currencies_ratio(nbp_cache)
             ldivs.append(dividend)
     return ldivs
 
 
-def process_dividend_docs(directory, debug=False):
-    """Count due tax based on statements files in directory."""
-    files = fh.pdfs_in_dir(directory)
+def dividends_from_files(paths, nbp_cache=None):
+    """Find all dividends in files, in the order of csv rows."""
     dividends = []
-    for filename in files:
-        text = fh.file_to_text(f"{directory}/{filename}")
-        if divs := get_stock_dividends_from_text(text):
+    for path in paths:
+        text = fh.file_to_text(path)
+        filename = os.path.basename(path)
+        if divs := get_stock_dividends_from_text(text, nbp_cache=nbp_cache):
             for div in divs:
                 div.file = filename
             dividends += divs
-        if ldivs := get_liquidity_dividends_from_text(text):
+        if ldivs := get_liquidity_dividends_from_text(text, nbp_cache=nbp_cache):
             for ldiv in ldivs:
                 ldiv.file = filename
             dividends += ldivs
+    return dividends
+
+
+def process_dividend_docs(directory, debug=False):
+    """Count due tax based on statements files in directory."""
+    files = fh.pdfs_in_dir(directory)
+    dividends = dividends_from_files([f"{directory}/{filename}" for filename in files])
     if debug:
         fh.write_objects_debug_json({"dividends": dividends}, "dividends.json")
     fh.save_csv("_dividend.csv", Dividend.csv_header(), [d.csved() for d in dividends])
@@ -1,6 +1,7 @@
 """Implement common functions for files processing."""
 
 import glob
+import io
 import json
 import os
 
@@ -27,14 +28,48 @@ def file_to_text(filename):
     return text
 
 
+def bytes_to_text(data):
+    """Parse in-memory PDF file to text only."""
+    return file_to_text(io.BytesIO(data))
+
+
+def csv_text(header, lines):
+    """Join header and lines to csv content, empty if there are no lines."""
+    if not lines:
+        return ""
+    return "".join(f"{line}\n" for line in [header, *lines])
+
+
 def save_csv(filename, header, lines):
     """Save header and lines to a csv file."""
     if not lines:
         return
     with open(filename, "w", encoding="utf-8") as file:
-        file.write(f"{header}\n")
-        for line in lines:
-            file.write(f"{line}\n")
+        file.write(csv_text(header, lines))
+
+
+class LineWriter:
+    """Write lines to a file opened lazily on the first line, with an optional header."""
+
+    def __init__(self, filename, header=None):
+        """Init writer, the file is not created until a line is written."""
+        self.filename = filename
+        self.header = header
+        self.file = None
+
+    def write(self, line):
+        """Write a single line, creating the file with header if needed."""
+        if self.file is None:
+            self.file = open(self.filename, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+            if self.header is not None:
+                self.file.write(f"{self.header}\n")
+        self.file.write(f"{line}\n")
+
+    def close(self):
+        """Close the file if it was ever opened."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
 
 
 def merge_csvs():
@@ -45,6 +80,12 @@ def merge_csvs():
         os.remove(file_name)
 
 
+def object_debug_json_line(kind: str, obj) -> str:
+    """Dump created object as a single JSON line for debug purposes."""
+    out = {"kind": kind, **obj.__dict__}
+    return json.dumps(out, sort_keys=True, ensure_ascii=False, default=str)
+
+
 def write_objects_debug_json(data: dict, filename: str):
     """Save created objects for debug purposes."""
     out = {}
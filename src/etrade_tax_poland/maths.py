@@ -1,20 +1,154 @@
 """Common maths variables and functions."""
 
-import math
+from decimal import Decimal
+from functools import lru_cache, total_ordering
 
 TAX_PL = 0.19
 ISO_DATE = "%Y-%m-%d"
 
 
-def round_up(number):
-    """Round number up to the second decimal point."""
-    return math.ceil(number * 100) / 100
+def parse_amount(str_number):
+    """Parse cash string to (integer units, decimal places)."""
+    # cash formats:
+    # ['1,000.00', '$100.00', '(100.00)', '($2.00)', '-0.5', '$-0.5', '-$0.5']
+    text = str_number.strip("$() ").replace(",", "")
+    if text[:2] == "-$":
+        text = "-" + text[2:]
+    whole, _, fraction = text.partition(".")
+    digits = whole + fraction
+    if digits.isdigit() and digits.isascii():
+        return int(digits), len(fraction)
+    if digits[:1] == "-" and digits[1:].isdigit() and digits.isascii():
+        return -int(digits[1:]), len(fraction)
+    raise ValueError(f"Invalid amount: {str_number!r}")
 
 
-def cash_float(str_number):
-    """Cast cash string with many additional chars to float."""
-    # cash formats:
-    # ['1,000.00', '$100.00', '(100.00)', '($2.00)']
-    for char in "$,()":
-        str_number = str_number.replace(char, "")
-    return float(str_number)
+def cash_decimal(str_number):
+    """Cast cash string with many additional chars to exact Decimal."""
+    units, scale = parse_amount(str_number)
+    return Decimal(units).scaleb(-scale)
+
+
+@lru_cache(maxsize=4096, typed=True)
+def exact_ratio(value):
+    """Return int, float, Decimal or str number as exact (numerator, positive denominator)."""
+    if isinstance(value, float):
+        # repr of a float is the shortest string that round-trips, i.e. the NBP/cache decimal
+        value = Decimal(repr(value))
+    elif isinstance(value, str):
+        value = Decimal(value)
+    # typed cache, as Decimal(0.1) == 0.1 would otherwise share the float entry
+    return value.as_integer_ratio()
+
+
+def div_half_up(numerator, denominator):
+    """Divide integers, rounding half away from zero (Polish rounding of grosz)."""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    if numerator >= 0:
+        return (2 * numerator + denominator) // (2 * denominator)
+    return -((denominator - 2 * numerator) // (2 * denominator))
+
+
+@total_ordering
+class Money:
+    """Cash amount kept as an integer count of cents/grosz."""
+
+    __slots__ = ("grosz",)
+
+    def __init__(self, grosz=0):
+        """Init money object from integer cents/grosz."""
+        self.grosz = grosz
+
+    @classmethod
+    def parse(cls, str_number):
+        """Parse cash string, rounding any sub-grosz part half up."""
+        # fast path for the common '$2,499.48' format, other dots fail isdecimal
+        if str_number[-3:-2] == ".":
+            digits = str_number.replace(",", "").replace(".", "", 1).lstrip("$")
+            if digits.isdecimal() and digits.isascii():
+                return cls(int(digits))
+        units, scale = parse_amount(str_number)
+        if scale == 2:
+            return cls(units)
+        return cls(div_half_up(units * 100, 10**scale))
+
+    @classmethod
+    def of(cls, value):
+        """Create money from decimal number (float, int or str), rounding half up."""
+        numerator, denominator = exact_ratio(value)
+        return cls(div_half_up(numerator * 100, denominator))
+
+    def scaled(self, numerator, denominator=1):
+        """Multiply by exact fraction and round the result half up to grosz."""
+        return Money(div_half_up(self.grosz * numerator, denominator))
+
+    def __mul__(self, factor):
+        # hot path, div_half_up inlined as exact_ratio denominator is always positive
+        numerator, denominator = exact_ratio(factor)
+        product = 2 * self.grosz * numerator
+        if product >= 0:
+            return Money((product + denominator) // (2 * denominator))
+        return Money(-((denominator - product) // (2 * denominator)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        divisor_numerator, divisor_denominator = exact_ratio(divisor)
+        return Money(div_half_up(self.grosz * divisor_denominator, divisor_numerator))
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.grosz + other.grosz)
+        if other == 0:
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.grosz - other.grosz)
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.grosz)
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.grosz == other.grosz
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Money):
+            return self.grosz < other.grosz
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.grosz)
+
+    def __bool__(self):
+        return self.grosz != 0
+
+    def __float__(self):
+        return self.grosz / 100
+
+    def __str__(self):
+        sign = "-" if self.grosz < 0 else ""
+        whole, cents = divmod(abs(self.grosz), 100)
+        return f"{sign}{whole}.{cents:02d}"
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __format__(self, spec):
+        if spec in ("", ".2f"):
+            return str(self)
+        return format(float(self), spec)
+
+
+def pln_price(usd_price, ratio):
+    """Convert USD price to PLN with a single half-up rounding to grosz."""
+    price_num, price_den = exact_ratio(usd_price)
+    ratio_num, ratio_den = exact_ratio(ratio)
+    return Money(100).scaled(price_num * ratio_num, price_den * ratio_den)
@@ -0,0 +1,252 @@
+"""Process all statements in a streaming pipeline of stages connected by bounded queues."""
+
+import os
+import queue
+import threading
+import time
+
+from . import dividends
+from . import files_handling as fh
+from . import stocks
+from .cache.nbp import date_to_usd_pln
+from .dividends import Dividend
+from .report import Report
+from .stocks import EsppStock, RestrictedStock, StockEvent, Trade
+
+QUEUE_SIZE = 4
+POLL_INTERVAL = 0.1
+
+_DONE = object()  # end of stream marker passed down the stages
+
+
+class StageStats:
+    """Keep throughput and input queue depth counters for a single stage."""
+
+    def __init__(self, name):
+        """Init empty counters."""
+        self.name = name
+        self.items = 0
+        self.busy_time = 0.0
+        self.wall_time = 0.0
+        self.depth_samples = 0
+        self.depth_sum = 0
+        self.depth_max = 0
+
+    def sample_depth(self, depth):
+        """Record input queue depth seen when taking an item."""
+        self.depth_samples += 1
+        self.depth_sum += depth
+        self.depth_max = max(self.depth_max, depth)
+
+    def csved(self):
+        """Csved class object."""
+        avg_depth = self.depth_sum / self.depth_samples if self.depth_samples else 0.0
+        throughput = self.items / self.wall_time if self.wall_time else 0.0
+        utilization = self.busy_time / self.wall_time if self.wall_time else 0.0
+        return ",".join(
+            [
+                self.name,
+                f"{self.items}",
+                f"{self.busy_time:.3f}",
+                f"{throughput:.2f}",
+                f"{utilization:.2f}",
+                f"{avg_depth:.2f}",
+                f"{self.depth_max}",
+            ]
+        )
+
+    @staticmethod
+    def csv_header():
+        """Return table header for CSVed objects."""
+        return ",".join(
+            [
+                "STAGE",
+                "ITEMS",
+                "BUSY_S",
+                "ITEMS_PER_S",
+                "UTILIZATION",
+                "AVG_QUEUE_DEPTH",
+                "MAX_QUEUE_DEPTH",
+            ]
+        )
+
+
+class Stage(threading.Thread):
+    """Run a function on every item from inbox and pass its results to outbox."""
+
+    # all of them are needed to wire the stage between its neighbours
+    def __init__(self, name, func, inbox, outbox, stop):  # pylint: disable=too-many-arguments
+        """Init stage, inbox is a queue or (for the first stage) any iterable."""
+        super().__init__(name=f"etrade-{name}", daemon=True)
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stop = stop
+        self.stats = StageStats(name)
+        self.error = None
+
+    def _items(self):
+        """Yield input items until the end of stream or a stop request."""
+        if not isinstance(self.inbox, queue.Queue):
+            for item in self.inbox:
+                if self.stop.is_set():
+                    return
+                yield item
+            return
+        while not self.stop.is_set():
+            try:
+                item = self.inbox.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                return
+            self.stats.sample_depth(self.inbox.qsize())
+            yield item
+
+    def _put(self, item):
+        """Put item to outbox, blocking while it is full (backpressure)."""
+        while self.outbox is not None:
+            try:
+                self.outbox.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                if self.stop.is_set():
+                    return
+
+    def run(self):
+        """Process items until the end of stream, stop everything on error."""
+        start = time.perf_counter()
+        try:
+            for item in self._items():
+                busy_start = time.perf_counter()
+                results = self.func(item)
+                self.stats.busy_time += time.perf_counter() - busy_start
+                self.stats.items += 1
+                for result in results:
+                    self._put(result)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self.error = exc
+            self.stop.set()
+        finally:
+            self.stats.wall_time = time.perf_counter() - start
+            self._put(_DONE)
+
+
+def read_stage(full_path):
+    """Read the whole PDF file into memory."""
+    with open(full_path, "rb") as file:
+        return [(full_path, file.read())]
+
+
+def extract_stage(item):
+    """Extract text from in-memory PDF."""
+    full_path, data = item
+    return [(full_path, fh.bytes_to_text(data))]
+
+
+def parse_records(text, name):
+    """Find all dividends and stocks data in text, without resolving rates."""
+    records = dividends.get_stock_dividends_from_text(text, resolve=False)
+    records += dividends.get_liquidity_dividends_from_text(text, resolve=False)
+    for parse in (stocks.espp_from_text, stocks.rs_from_text, stocks.trade_from_text):
+        if record := parse(text, resolve=False):
+            records.append(record)
+    for record in records:
+        record.file = os.path.basename(name) if isinstance(record, Dividend) else name
+    return records
+
+
+def resolve_rates(record, nbp_cache=None, intc_cache=None):
+    """Insert currencies ratios and stock prices and calculate dependent variables."""
+    if isinstance(record, Dividend):
+        record.insert_currencies_ratio(nbp_cache)
+    elif isinstance(record, EsppStock):
+        record.calculate_pln_contribution_net()
+        record.insert_initial_price_pln(nbp_cache, intc_cache)
+    elif isinstance(record, RestrictedStock):
+        record.insert_ratios(nbp_cache, intc_cache)
+    elif isinstance(record, Trade):
+        record.insert_currencies_ratio(*date_to_usd_pln(record.trade_date, nbp_cache))
+    return record
+
+
+def parse_stage(item):
+    """Parse extracted text into records."""
+    full_path, text = item
+    return parse_records(text, full_path)
+
+
+class RowWriter:
+    """Write resolved dividends as csv rows as soon as they arrive, stock rows on close."""
+
+    debug_kinds = {Dividend: "dividends", EsppStock: "espp", RestrictedStock: "rs", Trade: "trade"}
+
+    def __init__(self, debug=False):
+        """Init lazily created output files."""
+        self.dividends = fh.LineWriter("_dividend.csv", Dividend.csv_header())
+        # stock records are small, kept to write them grouped like process_stock_docs does
+        self.stocks = Report()
+        self.dividends_debug = fh.LineWriter("dividends.jsonl") if debug else None
+        self.stocks_debug = fh.LineWriter("stocks.jsonl") if debug else None
+
+    def __call__(self, record):
+        """Write a single record."""
+        if isinstance(record, Dividend):
+            self.dividends.write(record.csved())
+            debug_writer = self.dividends_debug
+        else:
+            self.stocks.add(record)
+            debug_writer = self.stocks_debug
+        if debug_writer is not None:
+            debug_writer.write(fh.object_debug_json_line(self.debug_kinds[type(record)], record))
+
+    def close(self):
+        """Write grouped stock rows and close all output files."""
+        ses = self.stocks.stock_events()
+        fh.save_csv("_stocks.csv", StockEvent.csv_header(), [s.csved() for s in ses])
+        for writer in (self.dividends, self.dividends_debug, self.stocks_debug):
+            if writer is not None:
+                writer.close()
+
+
+def run_pipeline(files, sink, queue_size=QUEUE_SIZE, nbp_cache=None, intc_cache=None):
+    """Pass files through all stages and resolved records to sink, return per-stage statistics."""
+    stop = threading.Event()
+    steps = [
+        ("read", read_stage),
+        ("extract", extract_stage),
+        ("parse", parse_stage),
+        ("resolve", lambda record: [resolve_rates(record, nbp_cache, intc_cache)]),
+        ("write", lambda record: sink(record) or []),
+    ]
+    stages = []
+    inbox = files
+    for i, (name, func) in enumerate(steps):
+        outbox = queue.Queue(maxsize=queue_size) if i < len(steps) - 1 else None
+        stages.append(Stage(name, func, inbox, outbox, stop))
+        inbox = outbox
+    for stage in stages:
+        stage.start()
+    for stage in stages:
+        stage.join()
+    for stage in stages:
+        if stage.error is not None:
+            raise stage.error
+    return [stage.stats for stage in stages]
+
+
+def process_docs_streaming(directory, debug=False, queue_size=QUEUE_SIZE):
+    """Process all docs in a pipeline, return per-stage statistics."""
+    files = [f"{directory}/{filename}" for filename in fh.pdfs_in_dir(directory)]
+    writer = RowWriter(debug)
+    try:
+        return run_pipeline(files, writer, queue_size)
+    finally:
+        writer.close()
+
+
+def print_stages_stats(stats):
+    """Print per-stage statistics table."""
+    print(StageStats.csv_header())
+    for stage_stats in stats:
+        print(stage_stats.csved())
@@ -0,0 +1,39 @@
+"""Keep records computed from statements, in the order of csv rows."""
+
+from . import files_handling as fh
+from .dividends import Dividend
+from .stocks import EsppStock, RestrictedStock, StockEvent, Trade
+
+
+class Report:
+    """Keep all records computed from statements."""
+
+    def __init__(self):
+        """Init empty report."""
+        self.dividends = []
+        self.espps = []  # Employee Stock Purchase Plan
+        self.rests = []  # Restricted Stock
+        self.trades = []  # stocks sell events
+
+    def add(self, record):
+        """Add record to the list of its type."""
+        if isinstance(record, Dividend):
+            self.dividends.append(record)
+        elif isinstance(record, EsppStock):
+            self.espps.append(record)
+        elif isinstance(record, RestrictedStock):
+            self.rests.append(record)
+        elif isinstance(record, Trade):
+            self.trades.append(record)
+
+    def stock_events(self):
+        """Sum up all stock records, in the same order as in the csv file."""
+        return [StockEvent(x) for x in self.espps + self.rests + self.trades]
+
+    def dividends_csv(self):
+        """Return dividends csv file content."""
+        return fh.csv_text(Dividend.csv_header(), [d.csved() for d in self.dividends])
+
+    def stocks_csv(self):
+        """Return stocks csv file content."""
+        return fh.csv_text(StockEvent.csv_header(), [s.csved() for s in self.stock_events()])
@@ -1,11 +1,12 @@
 """Find all statements for stocks in a directory and parse."""
 
 from datetime import datetime
+from decimal import Decimal
 
 from . import files_handling as fh
 from .cache.intc import date_to_intc_price
 from .cache.nbp import date_to_usd_pln
-from .maths import ISO_DATE, cash_float
+from .maths import ISO_DATE, Money, cash_decimal, exact_ratio, pln_price
 
 
 class Trade:
@@ -14,18 +15,18 @@ class Trade:
     def __init__(self):
         """Init trade object."""
         self.shares_sold = 0
-        self.usd_net_income = 0.0
+        self.usd_net_income = Money()
         self.trade_date = datetime.fromtimestamp(0)
         self.ratio_date = datetime.fromtimestamp(0)
         self.ratio_value = 0.0
-        self.pln_income = 0.0
+        self.pln_income = Money()
         self.file = ""
 
     def insert_currencies_ratio(self, ratio_date, ratio_value):
         """Insert currencies ratio and calculate dependent variables."""
         self.ratio_date = ratio_date
         self.ratio_value = ratio_value
-        self.pln_income = ratio_value * self.usd_net_income
+        self.pln_income = self.usd_net_income * ratio_value
 
 
 class EsppStock:
@@ -34,27 +35,27 @@ class EsppStock:
     def __init__(self):
         """Init espp bought stock object."""
         self.purchase_date = datetime.fromtimestamp(0)
-        self.initial_price_pln = 0.0
-        self.pln_contribution_gross = 0.0
-        self.usd_contribution_refund = 0.0
-        self.pln_contribution_net = 0.0
-        self.vest_day_ratio = 0.0
+        self.initial_price_pln = Money()
+        self.pln_contribution_gross = Money()
+        self.usd_contribution_refund = Money()
+        self.pln_contribution_net = Money()
+        self.vest_day_ratio = Decimal(0)
         self.shares_purchased = 0
         self.file = ""
-        self.period_start_value = 0.0
-        self.period_end_value = 0.0
-        self.purchase_price_base = 0.0
+        self.period_start_value = Decimal(0)
+        self.period_end_value = Decimal(0)
+        self.purchase_price_base = Decimal(0)
 
     def calculate_pln_contribution_net(self):
         """Based on set values, calculated net pln contribution."""
-        refund = round(self.usd_contribution_refund / self.vest_day_ratio, 2)
+        refund = self.usd_contribution_refund / self.vest_day_ratio
         self.pln_contribution_net = self.pln_contribution_gross - refund
 
-    def insert_initial_price_pln(self):
+    def insert_initial_price_pln(self, nbp_cache=None, intc_cache=None):
         """Insert intc price and calculate dependent variables."""
-        _, intc = date_to_intc_price(self.purchase_date)
-        _, ratio = date_to_usd_pln(self.purchase_date)
-        self.initial_price_pln = intc * ratio
+        _, intc = date_to_intc_price(self.purchase_date, intc_cache)
+        _, ratio = date_to_usd_pln(self.purchase_date, nbp_cache)
+        self.initial_price_pln = pln_price(intc, ratio)
 
 
 class RestrictedStock:
@@ -64,20 +65,20 @@ class RestrictedStock:
         """Init restricted stock object."""
         self.release_date = datetime.fromtimestamp(0)
         self.shares_released = 0
-        self.release_gain = 0.0
+        self.release_gain = Money()
         self.ratio_date = datetime.fromtimestamp(0)
         self.ratio_value = 0.0
-        self.stock_price_pln = 0.0
-        self.initial_price_pln = 0.0
+        self.stock_price_pln = Money()
+        self.initial_price_pln = Money()
         self.file = ""
 
-    def insert_ratios(self):
+    def insert_ratios(self, nbp_cache=None, intc_cache=None):
         """Insert currencies ratio and calculate dependent variables."""
-        self.ratio_date, self.ratio_value = date_to_usd_pln(self.release_date)
-        total_pln_gain = self.ratio_value * self.release_gain
-        self.stock_price_pln = total_pln_gain / self.shares_released
-        _, intc = date_to_intc_price(self.release_date)
-        self.initial_price_pln = intc * self.ratio_value
+        self.ratio_date, self.ratio_value = date_to_usd_pln(self.release_date, nbp_cache)
+        ratio_num, ratio_den = exact_ratio(self.ratio_value)
+        self.stock_price_pln = self.release_gain.scaled(ratio_num, ratio_den * self.shares_released)
+        _, intc = date_to_intc_price(self.release_date, intc_cache)
+        self.initial_price_pln = pln_price(intc, self.ratio_value)
 
 
 class StockEvent:
@@ -87,12 +88,12 @@ class StockEvent:
         """Init sum-up Stock object."""
         self.buy_date = 0
         self.buy_shares_count = 0
-        self.buy_tax_deductible = 0
-        self.buy_price_pln = 0
-        self.initial_price_pln = 0
+        self.buy_tax_deductible = Money()
+        self.buy_price_pln = Money()
+        self.initial_price_pln = Money()
         self.sale_date = 0
         self.sale_shares_count = 0
-        self.sale_income = 0
+        self.sale_income = Money()
         if isinstance(base_object, EsppStock):
             self.buy_date = base_object.purchase_date
             self.buy_shares_count = base_object.shares_purchased
@@ -102,7 +103,7 @@ class StockEvent:
         elif isinstance(base_object, RestrictedStock):
             self.buy_date = base_object.release_date
             self.buy_shares_count = base_object.shares_released
-            self.buy_tax_deductible = 0.0
+            self.buy_tax_deductible = Money()
             self.initial_price_pln = base_object.initial_price_pln
         elif isinstance(base_object, Trade):
             self.sale_date = base_object.trade_date
@@ -116,12 +117,12 @@ class StockEvent:
             [
                 self.buy_date.strftime(ISO_DATE) if self.buy_date else "",
                 f"{self.buy_shares_count}" if self.buy_shares_count else "",
-                f"{self.buy_tax_deductible:.2f}" if self.buy_tax_deductible else "",
-                f"{self.buy_price_pln:.2f}" if self.buy_price_pln else "",
-                f"{self.initial_price_pln:.2f}" if self.initial_price_pln else "",
+                str(self.buy_tax_deductible) if self.buy_tax_deductible else "",
+                str(self.buy_price_pln) if self.buy_price_pln else "",
+                str(self.initial_price_pln) if self.initial_price_pln else "",
                 self.sale_date.strftime(ISO_DATE) if self.sale_date else "",
                 f"{self.sale_shares_count}" if self.sale_shares_count else "",
-                f"{self.sale_income:.2f}" if self.sale_income else "",
+                str(self.sale_income) if self.sale_income else "",
             ]
         )
 
@@ -142,8 +143,8 @@ class StockEvent:
         )
 
 
-def espp_from_text(text):
-    """Find all ESPP bought stocks data in text."""
+def espp_from_text(text, resolve=True, nbp_cache=None, intc_cache=None):
+    """Find all ESPP bought stocks data in text, resolve rates unless disabled."""
     if "EMPLOYEE STOCK PLAN PURCHASE CONFIRMATION" not in text:
         return []
     lines = text.split("\n")
@@ -155,29 +156,30 @@ def espp_from_text(text):
             stock.purchase_date = datetime.strptime(date_str, "%m-%d-%Y")
         if "Foreign Contributions" in line:
             # 'Foreign Contributions 10,000.00'
-            stock.pln_contribution_gross = cash_float(line.split()[-1])
+            stock.pln_contribution_gross = Money.parse(line.split()[-1])
         if "Average Exchange Rate" in line:
             # 'Average Exchange Rate $0.250000'
-            stock.vest_day_ratio = cash_float(line.split()[-1])
+            stock.vest_day_ratio = cash_decimal(line.split()[-1])
         if "Amount Refunded" in line:
             # 'Amount Refunded ($2.00)'
-            stock.usd_contribution_refund = cash_float(line.split()[-1])
+            stock.usd_contribution_refund = Money.parse(line.split()[-1])
         if "Shares Purchased" in line and len(line.split()) == 3:
             # 'Shares Purchased 50.0000'
             stock.shares_purchased = int(float(line.split()[-1]))
         if "Grant Date Market Value" in line:
-            stock.period_start_value = cash_float(line.split()[-1])
+            stock.period_start_value = cash_decimal(line.split()[-1])
         if "Purchase Value per Share" in line:
-            stock.period_end_value = cash_float(line.split()[-1])
+            stock.period_end_value = cash_decimal(line.split()[-1])
         if "Purchase Price per Share" in line:
-            stock.purchase_price_base = cash_float(lines[i + 1].split()[-2])
-    stock.calculate_pln_contribution_net()
-    stock.insert_initial_price_pln()
+            stock.purchase_price_base = cash_decimal(lines[i + 1].split()[-2])
+    if resolve:
+        stock.calculate_pln_contribution_net()
+        stock.insert_initial_price_pln(nbp_cache, intc_cache)
     return stock
 
 
-def rs_from_text(text):
-    """Find all Restricted Stocks vested data in text."""
+def rs_from_text(text, resolve=True, nbp_cache=None, intc_cache=None):
+    """Find all Restricted Stocks vested data in text, resolve rates unless disabled."""
     if "EMPLOYEE STOCK PLAN RELEASE CONFIRMATION" not in text:
         return []
     lines = text.split("\n")
@@ -191,13 +193,14 @@ def rs_from_text(text):
             rest.shares_released = int(float(line.split()[-1]))
         if "Total Gain" in line:
             # 'Total Gain $500.00'
-            rest.release_gain = cash_float(line.split()[-1])
-    rest.insert_ratios()
+            rest.release_gain = Money.parse(line.split()[-1])
+    if resolve:
+        rest.insert_ratios(nbp_cache, intc_cache)
     return rest
 
 
-def trade_from_text(text):
-    """Find all trade data in text."""
+def trade_from_text(text, resolve=True, nbp_cache=None):
+    """Find all trade data in text, resolve rates unless disabled."""
     if "TRADECONFIRMATION" in text:
         lines = text.split("\n")
         trade = Trade()
@@ -209,8 +212,9 @@ def trade_from_text(text):
                 trade.trade_date = datetime.strptime(date_str, "%m/%d/%Y")
             if "NET AMOUNT" in line:
                 # 'NET AMOUNT $2,499.48'
-                trade.usd_net_income = cash_float(line.split()[-1])
-        trade.insert_currencies_ratio(*date_to_usd_pln(trade.trade_date))
+                trade.usd_net_income = Money.parse(line.split()[-1])
+        if resolve:
+            trade.insert_currencies_ratio(*date_to_usd_pln(trade.trade_date, nbp_cache))
         return trade
     if "Transaction Type: Sold" in text:
         lines = text.split("\n")
@@ -218,38 +222,44 @@ def trade_from_text(text):
         for i, line in enumerate(lines):
             if "Net Amount" in line:
                 # 'Net Amount $5,805.60'
-                trade.usd_net_income = cash_float(line.split()[-1])
+                trade.usd_net_income = Money.parse(line.split()[-1])
             if "Trade Date Settlement Date Quantity Price Settlement Amount" in line:
                 # 'Trade Date Settlement Date Quantity Price Settlement Amount'
                 # '02/20/2024 02/22/2024 100 45.00'
                 line_plus_one = lines[i + 1]
                 trade.shares_sold = int(line_plus_one.split()[2])
                 trade.trade_date = datetime.strptime(line_plus_one.split()[0], "%m/%d/%Y")
-        trade.insert_currencies_ratio(*date_to_usd_pln(trade.trade_date))
+        if resolve:
+            trade.insert_currencies_ratio(*date_to_usd_pln(trade.trade_date, nbp_cache))
         return trade
 
     return []
 
 
-def process_stock_docs(directory, debug=False):
-    """Process all docs and find stocks data."""
-    files = fh.pdfs_in_dir(directory)
+def stocks_from_files(paths, nbp_cache=None, intc_cache=None):
+    """Find all ESPP, RS and trade data in files."""
     espps = []  # Employee Stock Purchase Plan
     rests = []  # Restricted Stock
     trades = []  # stocks sell events
 
-    for filename in files:
-        full_path = f"{directory}/{filename}"
+    for full_path in paths:
         text = fh.file_to_text(full_path)
-        if espp := espp_from_text(text):
+        if espp := espp_from_text(text, nbp_cache=nbp_cache, intc_cache=intc_cache):
             espp.file = full_path
             espps.append(espp)
-        if rest := rs_from_text(text):
+        if rest := rs_from_text(text, nbp_cache=nbp_cache, intc_cache=intc_cache):
             rest.file = full_path
             rests.append(rest)
-        if trade := trade_from_text(text):
+        if trade := trade_from_text(text, nbp_cache=nbp_cache):
             trade.file = full_path
             trades.append(trade)
+    return espps, rests, trades
+
+
+def process_stock_docs(directory, debug=False):
+    """Process all docs and find stocks data."""
+    files = fh.pdfs_in_dir(directory)
+    espps, rests, trades = stocks_from_files([f"{directory}/{filename}" for filename in files])
 
     ses = [StockEvent(x) for x in espps + rests + trades]
 
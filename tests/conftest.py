@@ -0,0 +1,29 @@
+"""Shared fixtures, statements are plain text instead of PDF files."""
+
+import pytest
+
+from etrade_tax_poland import differential
+from etrade_tax_poland import files_handling as fh
+
+
+def dividend_statement(gross):
+    """Return statement bytes with a single INTEL dividend of given gross amount."""
+    return (
+        "Account DetailCLIENT STATEMENT     For the Period September 1 -30, 2023\n"
+        f"12/1 Qualified Dividend INTEL CORP {gross:.2f}\n"
+        f"12/1 Tax Withholding INTEL CORP ({gross * 0.15:.2f})\n"
+    ).encode()
+
+
+@pytest.fixture(name="statement")
+def fixture_statement(monkeypatch):
+    """Read statements as utf-8 text instead of PDF, return statement bytes factory."""
+    monkeypatch.setattr(fh, "file_to_text", lambda file: file.read().decode())
+    return dividend_statement
+
+
+@pytest.fixture(name="snapshot")
+def fixture_snapshot():
+    """Offline NBP ratios and intc prices caches, never requested from the network."""
+    nbp, intc = differential.load_snapshot()
+    return differential.SnapshotNbpRatiosCache(nbp), differential.SnapshotIntcPricesCache(intc)
@@ -0,0 +1,63 @@
+"""Test the embeddable compute API."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from etrade_tax_poland import Rates, compute
+from etrade_tax_poland.cache import nbp
+
+TRADE_STATEMENT = b"""TRADECONFIRMATION
+05/10/22 05/12/22 61 INTC SELL 50 $50.00 Stock Plan PRINCIPAL $2,500.00
+NET AMOUNT $2,499.48
+"""
+
+THREADS = 8
+
+
+@pytest.fixture(name="documents")
+def fixture_documents(statement):
+    """In-memory statements with dividends and a trade."""
+    return [statement(100 + i) for i in range(5)] + [TRADE_STATEMENT]
+
+
+def report_rows(report):
+    """Return all fields of all records, in the order of csv rows."""
+    return [vars(d) for d in report.dividends] + [vars(s) for s in report.stock_events()]
+
+
+def mtimes(directory):
+    """Return modification times of all files in directory."""
+    return {entry.name: entry.stat().st_mtime_ns for entry in os.scandir(directory)}
+
+
+def test_compute(documents, snapshot):
+    """Resolve records of all documents, named after their position."""
+    report = compute(documents, Rates(*snapshot))
+    assert [d.file for d in report.dividends] == [f"document_{i}.pdf" for i in range(5)]
+    assert [t.file for t in report.trades] == ["document_5.pdf"]
+    assert all(d.pln_gross for d in report.dividends)
+    assert report.trades[0].pln_income
+    assert report.dividends_csv().count("\n") == 6
+    assert report.stocks_csv().count("\n") == 2
+
+
+def test_compute_threads_no_side_effects(documents, snapshot, tmp_path, monkeypatch):
+    """Give identical reports in all threads sharing rates, without touching the filesystem."""
+    monkeypatch.chdir(tmp_path)
+    cache_dir = os.path.dirname(nbp.__file__)
+    cache_files = mtimes(cache_dir)
+    rates = Rates(*snapshot)
+    expected = compute(documents, Rates(*snapshot))
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        reports = list(executor.map(lambda _: compute(documents, rates), range(THREADS * 4)))
+
+    for report in reports:
+        assert report_rows(report) == report_rows(expected)
+        assert report.dividends_csv() == expected.dividends_csv()
+        assert report.stocks_csv() == expected.stocks_csv()
+    assert os.getcwd() == str(tmp_path)
+    assert not os.listdir(tmp_path)
+    assert mtimes(cache_dir) == cache_files
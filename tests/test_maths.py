@@ -0,0 +1,131 @@
+"""Test cash parsing and Money arithmetic."""
+
+from decimal import Decimal
+
+import pytest
+
+from etrade_tax_poland import maths
+from etrade_tax_poland.maths import Money
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1,000.00", (100000, 2)),
+        ("$100.00", (10000, 2)),
+        ("(100.00)", (10000, 2)),
+        ("($2.00)", (200, 2)),
+        ("$0.250000", (250000, 6)),
+        ("50", (50, 0)),
+        ("-0.5", (-5, 1)),
+        ("$-2.50", (-250, 2)),
+        ("-$2.50", (-250, 2)),
+    ],
+)
+def test_parse_amount(text, expected):
+    """Parse all E*TRADE cash formats."""
+    assert maths.parse_amount(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "-", ".", "1-2", "5-", "--5", "+5", "1_0", "1.2.3", "1$2"])
+def test_parse_amount_invalid(text):
+    """Reject misplaced signs and unknown chars."""
+    with pytest.raises(ValueError):
+        maths.parse_amount(text)
+
+
+def test_money_parse():
+    """Round sub-grosz part half away from zero."""
+    assert Money.parse("$2,499.48") == Money(249948)
+    assert Money.parse("NET 0.23".split()[-1]) == Money(23)
+    assert Money.parse("$1.005") == Money(101)
+    assert Money.parse("$1.004") == Money(100)
+    assert Money.parse("-1.005") == Money(-101)
+    assert Money.parse("-$5.00") == Money(-500)
+    assert Money.parse("1,000.00") == Money(100000)
+
+
+@pytest.mark.parametrize("text", ["1.2.34", "$1_0.00", "+5.00", "5.-0", "٣.00"])
+def test_money_parse_invalid(text):
+    """Reject in the fast path the same amounts as the strict parser."""
+    with pytest.raises(ValueError):
+        Money.parse(text)
+
+
+def test_cash_decimal():
+    """Keep all decimal places of ratios and prices."""
+    assert maths.cash_decimal("$0.250000") == Decimal("0.25")
+    assert str(maths.cash_decimal("$30.1234")) == "30.1234"
+
+
+def test_exact_ratio():
+    """Take floats as their shortest decimal repr."""
+    assert maths.exact_ratio(3.9876) == (9969, 2500)
+    assert maths.exact_ratio(0.19) == (19, 100)
+    assert maths.exact_ratio(1e-05) == (1, 100000)
+    assert maths.exact_ratio(7) == (7, 1)
+    assert maths.exact_ratio("0.5") == (1, 2)
+    assert maths.exact_ratio(Decimal("0.250000")) == (1, 4)
+
+
+@pytest.mark.parametrize("values", [(Decimal(0.1), 0.1), (0.1, Decimal(0.1))])
+def test_exact_ratio_typed_cache(values):
+    """Keep equal float and Decimal in separate cache entries, in any call order."""
+    maths.exact_ratio.cache_clear()
+    results = {type(value): maths.exact_ratio(value) for value in values}
+    assert results[float] == (1, 10)
+    assert results[Decimal] == Decimal(0.1).as_integer_ratio()
+    assert Money(100) * 0.1 == Money(10)
+
+
+@pytest.mark.parametrize(
+    "numerator, denominator, expected",
+    [(5, 10, 1), (4, 10, 0), (15, 10, 2), (-5, 10, -1), (-4, 10, 0), (5, -10, -1), (-15, -10, 2)],
+)
+def test_div_half_up(numerator, denominator, expected):
+    """Round half away from zero for all signs."""
+    assert maths.div_half_up(numerator, denominator) == expected
+
+
+def test_money_multiply_rounds_half_up():
+    """Round exact product half up to grosz."""
+    # 125.00 * 3.981 = 497.625, float rounding gives 497.62
+    assert Money(12500) * 3.981 == Money(49763)
+    assert Money(49763) * 0.19 == Money(9455)
+    assert Money(-12500) * 3.981 == Money(-49763)
+    assert Money(100) * 1e-05 == Money(0)
+    assert 2 * Money(150) == Money(300)
+
+
+def test_money_divide():
+    """Round exact quotient half up to grosz."""
+    assert Money(200) / Decimal("0.25") == Money(800)
+    assert Money(100) / 3 == Money(33)
+    assert Money(200) / 3 == Money(67)
+    assert Money(100) / -3 == Money(-33)
+
+
+def test_money_arithmetic_and_ordering():
+    """Add, subtract, compare and sum money."""
+    assert Money(150) + Money(50) == Money(200)
+    assert Money(150) - Money(200) == Money(-50)
+    assert -Money(5) == Money(-5)
+    assert sum([Money(1), Money(2)]) == Money(3)
+    assert Money(1) < Money(2) <= Money(2)
+    assert not Money()
+    assert Money(1)
+
+
+@pytest.mark.parametrize(
+    "grosz, text",
+    [(0, "0.00"), (5, "0.05"), (-5, "-0.05"), (249948, "2499.48"), (-100000, "-1000.00")],
+)
+def test_money_format(grosz, text):
+    """Format money with two decimal places."""
+    assert str(Money(grosz)) == text
+    assert f"{Money(grosz):.2f}" == text
+
+
+def test_pln_price():
+    """Round USD price times ratio once."""
+    assert maths.pln_price(24.8342, 3.8027) == Money(9444)
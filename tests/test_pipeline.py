@@ -0,0 +1,97 @@
+"""Test the streaming pipeline stages."""
+
+import threading
+import time
+
+import pytest
+
+from etrade_tax_poland import pipeline
+from etrade_tax_poland.dividends import Dividend
+from etrade_tax_poland.maths import Money
+
+FILES_COUNT = 12
+
+
+@pytest.fixture(name="files")
+def fixture_files(tmp_path, statement):
+    """Write text statements with growing dividends, return their paths in order."""
+    paths = []
+    for i in range(FILES_COUNT):
+        path = tmp_path / f"statement_{i:02d}.pdf"
+        path.write_bytes(statement(100 + i))
+        paths.append(str(path))
+    return paths
+
+
+def pipeline_threads():
+    """Return all pipeline stage threads still running."""
+    return [thread for thread in threading.enumerate() if thread.name.startswith("etrade-")]
+
+
+def run(files, sink, snapshot, queue_size=pipeline.QUEUE_SIZE):
+    """Run pipeline with offline rates."""
+    nbp_cache, intc_cache = snapshot
+    return pipeline.run_pipeline(files, sink, queue_size, nbp_cache, intc_cache)
+
+
+@pytest.mark.parametrize("queue_size", [1, 4])
+def test_rows_in_files_order(files, snapshot, queue_size):
+    """Pass resolved records to sink in the order of files, count items of every stage."""
+    records = []
+    stats = run(files, records.append, snapshot, queue_size)
+    assert [r.file for r in records] == [f"statement_{i:02d}.pdf" for i in range(FILES_COUNT)]
+    assert [r.usd_gross for r in records] == [Money((100 + i) * 100) for i in range(FILES_COUNT)]
+    assert all(isinstance(record, Dividend) and record.pln_gross for record in records)
+    assert [(s.name, s.items) for s in stats] == [
+        (name, FILES_COUNT) for name in ("read", "extract", "parse", "resolve", "write")
+    ]
+    assert not pipeline_threads()
+
+
+def test_backpressure(files, snapshot):
+    """Keep at most one item in each queue while the last stage is slow."""
+    records = []
+
+    def slow_sink(record):
+        time.sleep(0.005)
+        records.append(record)
+
+    stats = run(files, slow_sink, snapshot, queue_size=1)
+    assert len(records) == FILES_COUNT
+    assert all(s.depth_max <= 1 for s in stats)
+
+
+def test_sink_error_stops_all_stages(files, snapshot):
+    """Raise the error of the last stage, after all stages are stopped."""
+    records = []
+
+    def failing_sink(record):
+        if len(records) == 2:
+            raise RuntimeError("disk full")
+        records.append(record)
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        run(files, failing_sink, snapshot, queue_size=1)
+    assert len(records) == 2
+    assert not pipeline_threads()
+
+
+def test_first_stage_error(files, snapshot):
+    """Raise the error of the read stage, without passing later files on."""
+    records = []
+    with pytest.raises(FileNotFoundError):
+        run([files[0], files[0] + ".missing", *files[1:]], records.append, snapshot)
+    assert len(records) <= 1
+    assert not pipeline_threads()
+
+
+def test_stage_stats_csved():
+    """Count throughput, utilization and queue depths."""
+    stats = pipeline.StageStats("parse")
+    stats.items = 4
+    stats.busy_time = 1.0
+    stats.wall_time = 2.0
+    for depth in (0, 2, 1):
+        stats.sample_depth(depth)
+    assert stats.csved() == "parse,4,1.000,2.00,0.50,1.00,2"
+    assert stats.csv_header().count(",") == stats.csved().count(",")